@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import read_until
+
 print("Capturing detailed boot sequence...")
 
 try:
@@ -17,14 +19,10 @@ try:
     print("\n=== COMPLETE BOOT LOG ===\n")
 
     # Capture for 15 seconds
-    start_time = time.time()
     line_count = 0
-    while (time.time() - start_time) < 15:
-        if ser.in_waiting:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            if line:
-                print(line)
-                line_count += 1
+    for line in read_until(ser, time.monotonic() + 15):
+        print(line)
+        line_count += 1
 
     print(f"\n=== END BOOT LOG ({line_count} lines) ===\n")
 
@@ -1,6 +1,30 @@
 #!/usr/bin/env python3
 import serial
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from serial_utils import SKIP_PREFIXES, read_until
+
+# Upper bound on how long to wait for beacons to fill the neighbor tables
+NEIGHBOR_WAIT = 30
+
+
+def poll_radio(ser, command, duration, skip=()):
+    """Send a command to one radio and collect its output for duration seconds"""
+    ser.write(command)
+    return list(read_until(ser, time.monotonic() + duration, skip))
+
+
+def poll_all(radios, command, duration, skip=()):
+    """Poll every radio at once; the UART waits overlap instead of adding up"""
+    with ThreadPoolExecutor(max_workers=len(radios)) as ex:
+        return list(ex.map(lambda ser: poll_radio(ser, command, duration, skip), radios))
+
+
+def has_neighbors(lines):
+    """True once a neighbor table lists at least one entry"""
+    return any(" pkts, " in line for line in lines)
+
 
 print("Checking all 3 radios...")
 
@@ -18,64 +42,36 @@ try:
 
     time.sleep(1)
 
+    radios = [r1, r2, r3]
+
     # Get status from all radios
     print("\n=== Getting Radio Status ===")
-    r1.write(b"status\n")
-    r2.write(b"status\n")
-    r3.write(b"status\n")
+    statuses = poll_all(radios, b"status\n", 2, skip=(b"[GPS]",))
 
-    time.sleep(2)
+    for n, lines in enumerate(statuses, 1):
+        print(f"\n=== Radio {n} Status ===")
+        for line in lines:
+            print(f"R{n}: {line}")
 
-    print("\n=== Radio 1 Status ===")
-    while r1.in_waiting:
-        line = r1.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]"):
-            print(f"R1: {line}")
-
-    print("\n=== Radio 2 Status ===")
-    while r2.in_waiting:
-        line = r2.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]"):
-            print(f"R2: {line}")
-
-    print("\n=== Radio 3 Status ===")
-    while r3.in_waiting:
-        line = r3.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]"):
-            print(f"R3: {line}")
-
-    # Wait for beacons to propagate
-    print("\n\n=== Waiting 30 seconds for neighbor discovery ===")
-    time.sleep(30)
-
-    # Check neighbor tables
-    r1.reset_input_buffer()
-    r2.reset_input_buffer()
-    r3.reset_input_buffer()
+    # Wait for beacons to propagate, stopping early once every radio sees a neighbor
+    print(f"\n\n=== Waiting up to {NEIGHBOR_WAIT} seconds for neighbor discovery ===")
+    deadline = time.monotonic() + NEIGHBOR_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(2)
 
-    print("\n=== Checking Neighbor Tables ===")
-    r1.write(b"neighbors\n")
-    time.sleep(1)
-    print("\n--- Radio 1 Neighbors ---")
-    while r1.in_waiting:
-        line = r1.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]") and not line.startswith("[ISR]") and not line.startswith("[RADIO]"):
-            print(line)
+        r1.reset_input_buffer()
+        r2.reset_input_buffer()
+        r3.reset_input_buffer()
 
-    r2.write(b"neighbors\n")
-    time.sleep(1)
-    print("\n--- Radio 2 Neighbors ---")
-    while r2.in_waiting:
-        line = r2.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]") and not line.startswith("[ISR]") and not line.startswith("[RADIO]"):
-            print(line)
+        neighbor_tables = poll_all(radios, b"neighbors\n", 1, skip=SKIP_PREFIXES)
+        if all(has_neighbors(lines) for lines in neighbor_tables):
+            break
 
-    r3.write(b"neighbors\n")
-    time.sleep(1)
-    print("\n--- Radio 3 Neighbors ---")
-    while r3.in_waiting:
-        line = r3.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]") and not line.startswith("[ISR]") and not line.startswith("[RADIO]"):
+    print("\n=== Checking Neighbor Tables ===")
+
+    for n, lines in enumerate(neighbor_tables, 1):
+        print(f"\n--- Radio {n} Neighbors ---")
+        for line in lines:
             print(line)
 
     r1.close()
@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import read_until
+
 print("Resetting Radio 1 and capturing boot output...")
 try:
     # Open serial
@@ -15,11 +17,8 @@ try:
 
     # Capture boot messages
     print("\n=== BOOT OUTPUT ===")
-    start_time = time.time()
-    while (time.time() - start_time) < 5:
-        if ser.in_waiting:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            print(line)
+    for line in read_until(ser, time.monotonic() + 5):
+        print(line)
 
     print("\n=== END BOOT OUTPUT ===\n")
 
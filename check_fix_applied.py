@@ -17,12 +17,15 @@ try:
     print("=== BOOT MESSAGES ===\n")
     found_fix = False
     for i in range(50):
-        if ser.in_waiting:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            print(line)
-            if "DIO1 IRQ configured" in line:
-                found_fix = True
-                print("\n✅ FIX CONFIRMED: DIO1 IRQ configuration found!\n")
+        # Blocks up to the port timeout; an empty read means boot output is done
+        raw = ser.readline()
+        if not raw:
+            break
+        line = raw.decode('utf-8', errors='ignore').strip()
+        print(line)
+        if "DIO1 IRQ configured" in line:
+            found_fix = True
+            print("\n✅ FIX CONFIRMED: DIO1 IRQ configuration found!\n")
 
     if not found_fix:
         print("\n❌ FIX NOT FOUND: 'DIO1 IRQ configured' message missing!\n")
@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import read_until
+
 print("Capturing FULL boot sequence...")
 
 try:
@@ -15,12 +17,8 @@ try:
     print("\n=== FULL BOOT LOG ===\n")
 
     # Capture everything for 10 seconds
-    start_time = time.time()
-    while (time.time() - start_time) < 10:
-        if ser.in_waiting:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            if line:
-                print(line)
+    for line in read_until(ser, time.monotonic() + 10):
+        print(line)
 
     print("\n=== END BOOT LOG ===\n")
 
@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import SKIP_PREFIXES
+
 print("=" * 70)
 print("MESH NETWORK STATUS")
 print("=" * 70)
@@ -15,9 +17,9 @@ time.sleep(1)
 
 print("\n[STATUS]")
 while radio.in_waiting:
-    line = radio.readline().decode('utf-8', errors='ignore').strip()
-    if line and not line.startswith("[GPS]") and not line.startswith("[ISR]"):
-        print(f"  {line}")
+    line = radio.readline().strip()
+    if line and not line.startswith((b"[GPS]", b"[ISR]")):
+        print(f"  {line.decode('utf-8', errors='ignore')}")
 
 # Neighbors
 radio.write(b"neighbors\n")
@@ -25,9 +27,9 @@ time.sleep(1)
 
 print("\n[NEIGHBORS - Radio 2 can see:]")
 while radio.in_waiting:
-    line = radio.readline().decode('utf-8', errors='ignore').strip()
-    if line and not line.startswith("[GPS]") and not line.startswith("[ISR]") and not line.startswith("[RADIO]"):
-        print(f"  {line}")
+    line = radio.readline().strip()
+    if line and not line.startswith(SKIP_PREFIXES):
+        print(f"  {line.decode('utf-8', errors='ignore')}")
 
 # Routes
 radio.write(b"routes\n")
@@ -35,9 +37,9 @@ time.sleep(1)
 
 print("\n[ROUTES - Known paths:]")
 while radio.in_waiting:
-    line = radio.readline().decode('utf-8', errors='ignore').strip()
-    if line and not line.startswith("[GPS]") and not line.startswith("[ISR]") and not line.startswith("[RADIO]"):
-        print(f"  {line}")
+    line = radio.readline().strip()
+    if line and not line.startswith(SKIP_PREFIXES):
+        print(f"  {line.decode('utf-8', errors='ignore')}")
 
 print("\n" + "=" * 70)
 print("SUMMARY:")
@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import wait_readable
+
 print("Monitoring both radios for DIO1 state...")
 print("Waiting 15 seconds for boot...\n")
 time.sleep(15)
@@ -15,23 +17,16 @@ try:
     print("Sending beacon from Radio 1...")
     print("=" * 60)
     r1.write(b"beacon\n")
-    time.sleep(1)
 
     # Monitor for 15 seconds
     print("\nMonitoring for 15 seconds...\n")
-    start_time = time.time()
-    while (time.time() - start_time) < 15:
-        if r1.in_waiting:
-            line = r1.readline().decode('utf-8', errors='ignore').strip()
-            if "[RADIO] DIO1" in line or "[ISR]" in line or "beacon" in line.lower():
-                print(f"R1: {line}")
-
-        if r2.in_waiting:
-            line = r2.readline().decode('utf-8', errors='ignore').strip()
+    names = {r1: "R1", r2: "R2"}
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        for ser in wait_readable([r1, r2], deadline):
+            line = ser.readline().decode('utf-8', errors='ignore').strip()
             if "[RADIO] DIO1" in line or "[ISR]" in line or "beacon" in line.lower():
-                print(f"R2: {line}")
-
-        time.sleep(0.1)
+                print(f"{names[ser]}: {line}")
 
     r1.close()
     r2.close()
@@ -1,11 +1,42 @@
 #!/usr/bin/env python3
 """Live monitor for mesh routing activity"""
+import re
 import serial
 import time
-from datetime import datetime
+
+from serial_utils import wait_readable
+
+# Highlighted events in priority order: (group, label, pattern). A line that
+# matches several rules is shown under the earliest one.
+EVENTS = [
+    ("route_req", "🔍 ROUTE DISCOVERY", b"ROUTE_REQ"),
+    ("route_rep", "✅ ROUTE REPLY", b"ROUTE_REP"),
+    ("forward", "📡 FORWARDING", b"Forward"),
+    ("message", "💬 MESSAGE", "MESSAGE from|📨".encode()),
+    ("beacon", "📍 BEACON", b"Beacon from"),
+    ("rx", "📥 RX", b"ISR.*?OnRxDone"),
+    ("tx", "📤 TX", b"TX:"),
+    ("ack", "✔️  ACK", b"ACK"),
+    ("neighbor", "👋 NEW NEIGHBOR", b"Neighbor discovered"),
+    ("routing", "🗺️  ROUTING", b"route to|Route"),
+]
+
+# One pass over the raw bytes finds every rule that applies
+EVENT_RE = re.compile(b"|".join(b"(?P<%s>%s)" % (group.encode(), pattern)
+                                for group, _, pattern in EVENTS))
+EVENT_RANK = {group: (rank, label) for rank, (group, label, _) in enumerate(EVENTS)}
+
+_last_second = None
+_last_stamp = ""
 
 def timestamp():
-    return datetime.now().strftime("%H:%M:%S")
+    """HH:MM:SS for now, formatted at most once per second"""
+    global _last_second, _last_stamp
+    second = int(time.time())
+    if second != _last_second:
+        _last_second = second
+        _last_stamp = time.strftime("%H:%M:%S", time.localtime(second))
+    return _last_stamp
 
 print("=" * 70)
 print("LNK-22 Live Mesh Monitor")
@@ -47,40 +78,23 @@ try:
 
     # Monitor continuously
     while True:
-        if radio.in_waiting:
-            line = radio.readline().decode('utf-8', errors='ignore').strip()
-            if not line:
-                continue
-
-            # Filter out GPS spam
-            if "[GPS]" in line:
-                continue
-
-            # Highlight important events
-            if "ROUTE_REQ" in line:
-                print(f"[{timestamp()}] 🔍 ROUTE DISCOVERY: {line}")
-            elif "ROUTE_REP" in line:
-                print(f"[{timestamp()}] ✅ ROUTE REPLY: {line}")
-            elif "Forward" in line:
-                print(f"[{timestamp()}] 📡 FORWARDING: {line}")
-            elif "MESSAGE from" in line or "📨" in line:
-                print(f"[{timestamp()}] 💬 MESSAGE: {line}")
-            elif "Beacon from" in line:
-                print(f"[{timestamp()}] 📍 BEACON: {line}")
-            elif "ISR" in line and "OnRxDone" in line:
-                print(f"[{timestamp()}] 📥 RX: {line}")
-            elif "TX:" in line:
-                print(f"[{timestamp()}] 📤 TX: {line}")
-            elif "ACK" in line:
-                print(f"[{timestamp()}] ✔️  ACK: {line}")
-            elif "Neighbor discovered" in line:
-                print(f"[{timestamp()}] 👋 NEW NEIGHBOR: {line}")
-            elif "route to" in line or "Route" in line:
-                print(f"[{timestamp()}] 🗺️  ROUTING: {line}")
-            else:
-                # Print other messages
-                if line.startswith("["):
-                    print(f"[{timestamp()}] {line}")
+        # Sleep in select() until the radio has output
+        wait_readable([radio])
+        raw = radio.readline().strip()
+        if not raw:
+            continue
+
+        # Filter out GPS spam before paying for a decode
+        if b"[GPS]" in raw:
+            continue
+
+        # Highlight important events
+        event = min((EVENT_RANK[m.lastgroup] for m in EVENT_RE.finditer(raw)), default=None)
+        if event:
+            print(f"[{timestamp()}] {event[1]}: {raw.decode('utf-8', errors='ignore')}")
+        elif raw.startswith(b"["):
+            # Print other messages
+            print(f"[{timestamp()}] {raw.decode('utf-8', errors='ignore')}")
 
 except KeyboardInterrupt:
     print("\n\n[STOP] Monitoring stopped by user")
@@ -2,38 +2,47 @@
 """
 Monitor both LNK-22 radios in real-time
 """
-import serial
-import time
-import threading
+import asyncio
+import sys
 
-def monitor_radio(port, name):
+try:
+    import serial_asyncio
+except ImportError:
+    print("Error: pyserial-asyncio library not found.")
+    print("Install with: pip3 install pyserial-asyncio")
+    sys.exit(1)
+
+RADIOS = [("/dev/ttyACM0", "Radio1"), ("/dev/ttyACM1", "Radio2")]
+
+# Open connections shared with send_commands: { port: StreamWriter }
+writers = {}
+
+async def monitor_radio(port, name):
     """Monitor a single radio and print all output"""
     try:
-        ser = serial.Serial(port, 115200, timeout=0.1)
+        reader, writer = await serial_asyncio.open_serial_connection(url=port, baudrate=115200)
+        writers[port] = writer
         print(f"[{name}] Connected to {port}")
 
         # Send initial status
-        time.sleep(1)
-        ser.write(b"status\n")
+        await asyncio.sleep(1)
+        writer.write(b"status\n")
 
         while True:
-            if ser.in_waiting:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    print(f"[{name}] {line}")
-            time.sleep(0.1)
+            line = (await reader.readuntil(b"\n")).decode('utf-8', errors='ignore').strip()
+            if line:
+                print(f"[{name}] {line}")
 
-    except KeyboardInterrupt:
-        pass
     except Exception as e:
         print(f"[{name}] ERROR: {e}")
     finally:
-        if 'ser' in locals():
-            ser.close()
+        writers.pop(port, None)
+        if 'writer' in locals():
+            writer.close()
 
-def send_commands():
+async def send_commands():
     """Send test commands to both radios"""
-    time.sleep(3)  # Wait for monitoring to start
+    await asyncio.sleep(3)  # Wait for monitoring to start
 
     commands = [
         ("status", "Check status"),
@@ -41,25 +50,23 @@ def send_commands():
         ("neighbors", "Check neighbors"),
     ]
 
-    try:
-        for cmd, desc in commands:
-            print(f"\n{'='*60}")
-            print(f"Sending: {cmd} - {desc}")
-            print(f"{'='*60}")
+    for cmd, desc in commands:
+        print(f"\n{'='*60}")
+        print(f"Sending: {cmd} - {desc}")
+        print(f"{'='*60}")
 
-            # Send to both radios
-            for port in ["/dev/ttyACM0", "/dev/ttyACM1"]:
-                try:
-                    ser = serial.Serial(port, 115200, timeout=1)
-                    ser.write(f"{cmd}\n".encode())
-                    ser.close()
-                except:
-                    pass
+        # Send to both radios over the monitors' open connections
+        for writer in writers.values():
+            writer.write(f"{cmd}\n".encode())
 
-            time.sleep(3)  # Wait for responses
+        await asyncio.sleep(3)  # Wait for responses
 
-    except KeyboardInterrupt:
-        pass
+async def main():
+    """Run both monitors and the command sender on one event loop"""
+    await asyncio.gather(
+        *(monitor_radio(port, name) for port, name in RADIOS),
+        send_commands(),
+    )
 
 if __name__ == "__main__":
     print("="*60)
@@ -67,17 +74,7 @@ if __name__ == "__main__":
     print("Press Ctrl+C to stop")
     print("="*60)
 
-    # Start monitoring threads
-    t1 = threading.Thread(target=monitor_radio, args=("/dev/ttyACM0", "Radio1"), daemon=True)
-    t2 = threading.Thread(target=monitor_radio, args=("/dev/ttyACM1", "Radio2"), daemon=True)
-    t3 = threading.Thread(target=send_commands, daemon=True)
-
-    t1.start()
-    t2.start()
-    t3.start()
-
     try:
-        while True:
-            time.sleep(1)
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\nStopping...")
@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import read_until
+
 radio = serial.Serial("/dev/ttyACM1", 115200, timeout=0.1)
 time.sleep(1)
 
@@ -27,12 +29,8 @@ while radio.in_waiting:
 print("\nMonitoring for 30 seconds...")
 print("=" * 60)
 
-start = time.time()
-while time.time() - start < 30:
-    if radio.in_waiting:
-        line = radio.readline().decode('utf-8', errors='ignore').strip()
-        if line and not line.startswith("[GPS]"):
-            print(line)
+for line in read_until(radio, time.monotonic() + 30, skip=(b"[GPS]",)):
+    print(line)
 
 print("=" * 60)
 
@@ -2,6 +2,8 @@
 import serial
 import time
 
+from serial_utils import drain, read_until
+
 print("Quick Radio Test")
 print("="*60)
 
@@ -17,64 +19,61 @@ try:
 
     print("\n1. Getting Radio 1 status...")
     r1.write(b"status\n")
-    time.sleep(2)
-    while r1.in_waiting:
-        print(f"  R1: {r1.readline().decode('utf-8', errors='ignore').strip()}")
+    for line in drain(r1, max_wait=2):
+        print(f"  R1: {line}")
 
     print("\n2. Getting Radio 2 status...")
     r2.write(b"status\n")
-    time.sleep(2)
-    while r2.in_waiting:
-        print(f"  R2: {r2.readline().decode('utf-8', errors='ignore').strip()}")
+    for line in drain(r2, max_wait=2):
+        print(f"  R2: {line}")
 
     print("\n3. Radio 1 sending beacon...")
     r1.write(b"beacon\n")
-    time.sleep(1)
 
     print("   Radio 1 output:")
-    while r1.in_waiting:
-        print(f"  R1: {r1.readline().decode('utf-8', errors='ignore').strip()}")
+    # The radio goes quiet for the whole blocking transmit (~370 ms at SF10)
+    # before "TX complete", so allow a longer gap than for command replies
+    for line in drain(r1, idle=1.0, max_wait=2):
+        print(f"  R1: {line}")
 
     print("\n4. Waiting 3 seconds for Radio 2 to receive...")
-    time.sleep(3)
+    lines = list(read_until(r2, time.monotonic() + 3))
 
     print("   Radio 2 output:")
-    if r2.in_waiting:
-        while r2.in_waiting:
-            print(f"  R2: {r2.readline().decode('utf-8', errors='ignore').strip()}")
+    if lines:
+        for line in lines:
+            print(f"  R2: {line}")
     else:
         print("  R2: NO OUTPUT - Did not receive beacon!")
 
     print("\n5. Radio 2 sending beacon...")
     r2.write(b"beacon\n")
-    time.sleep(1)
 
     print("   Radio 2 output:")
-    while r2.in_waiting:
-        print(f"  R2: {r2.readline().decode('utf-8', errors='ignore').strip()}")
+    for line in drain(r2, idle=1.0, max_wait=2):  # Outlast the transmit, as above
+        print(f"  R2: {line}")
 
     print("\n6. Waiting 3 seconds for Radio 1 to receive...")
-    time.sleep(3)
+    lines = list(read_until(r1, time.monotonic() + 3))
 
     print("   Radio 1 output:")
-    if r1.in_waiting:
-        while r1.in_waiting:
-            print(f"  R1: {r1.readline().decode('utf-8', errors='ignore').strip()}")
+    if lines:
+        for line in lines:
+            print(f"  R1: {line}")
     else:
         print("  R1: NO OUTPUT - Did not receive beacon!")
 
     print("\n7. Final status check...")
     r1.write(b"neighbors\n")
     r2.write(b"neighbors\n")
-    time.sleep(2)
 
     print("\nRadio 1 neighbors:")
-    while r1.in_waiting:
-        print(f"  R1: {r1.readline().decode('utf-8', errors='ignore').strip()}")
+    for line in drain(r1, max_wait=2):
+        print(f"  R1: {line}")
 
     print("\nRadio 2 neighbors:")
-    while r2.in_waiting:
-        print(f"  R2: {r2.readline().decode('utf-8', errors='ignore').strip()}")
+    for line in drain(r2, max_wait=2):
+        print(f"  R2: {line}")
 
     r1.close()
     r2.close()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Shared serial helpers for the LNK-22 radio test scripts
+"""
+import select
+import time
+
+# Debug chatter the status scripts never want to show. Kept as bytes so
+# lines can be dropped before paying for a UTF-8 decode.
+SKIP_PREFIXES = (b"[GPS]", b"[ISR]", b"[RADIO]")
+
+
+def read_until(ser, deadline, skip=()):
+    """Yield decoded lines from ser until the monotonic deadline passes.
+
+    readline() blocks in the driver for up to ser.timeout, so the caller
+    sleeps in the kernel instead of spinning on in_waiting. Lines starting
+    with any of the bytes prefixes in skip are dropped undecoded.
+    """
+    while time.monotonic() < deadline:
+        raw = ser.readline().strip()
+        if raw and not raw.startswith(skip):
+            yield raw.decode('utf-8', errors='ignore')
+
+
+def wait_readable(ports, deadline=None):
+    """Block until any of ports has bytes to read and return the ready ones.
+
+    Returns an empty list once the monotonic deadline has passed; with no
+    deadline it waits indefinitely.
+    """
+    timeout = None
+    if deadline is not None:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return []
+    ready, _, _ = select.select(ports, [], [], timeout)
+    return ready
+
+
+def drain(ser, idle=0.2, max_wait=3.0):
+    """Collect a command's reply lines from ser.
+
+    Waits up to max_wait for the reply to start, then returns as soon as
+    the port has been quiet for idle seconds, so fast radios don't pay
+    for a fixed sleep and slow ones aren't cut off.
+    """
+    deadline = time.monotonic() + max_wait
+    heard = False
+    lines = []
+    while True:
+        wait_until = min(deadline, time.monotonic() + idle) if heard else deadline
+        if not wait_readable([ser], wait_until):
+            return lines
+        heard = True
+        line = ser.readline().decode('utf-8', errors='ignore').strip()
+        if line:
+            lines.append(line)
+
+
+def iter_lines(buf):
+    """Remove the complete lines from the bytearray buf and iterate over them.
+
+    Lines come back stripped but undecoded, so callers that filter most of
+    them never build a str for the ones they drop. A partial trailing line
+    stays in buf. buf is consumed immediately, not as the result is iterated.
+    """
+    *lines, tail = bytes(buf).split(b"\n")
+    buf[:] = tail
+    return map(bytes.strip, lines)
+
+
+def read_raw_lines(ser, buf):
+    """Move everything waiting on ser into buf and return its complete lines.
+
+    One read() per burst instead of one readline() per line; framing is
+    done by iter_lines().
+    """
+    waiting = ser.in_waiting
+    if waiting:
+        buf += ser.read(waiting)
+    return list(iter_lines(buf))
+
+
+def read_lines(ser, buf):
+    """Like read_raw_lines(), but decoded to str"""
+    return [line.decode('utf-8', errors='ignore') for line in read_raw_lines(ser, buf)]
+
+
+def read_raw_rest(ser, buf):
+    """Like read_raw_lines(), for a final read after which buf is discarded.
+
+    A trailing partial line is finished with readline(), which waits up to
+    ser.timeout for its newline, so the last line of a reply isn't lost.
+    """
+    lines = read_raw_lines(ser, buf)
+    if buf:
+        buf += ser.readline()
+        lines.append(bytes(buf).strip())
+        buf.clear()
+    return lines
+
+
+def read_rest(ser, buf):
+    """Like read_raw_rest(), but decoded to str"""
+    return [line.decode('utf-8', errors='ignore') for line in read_raw_rest(ser, buf)]
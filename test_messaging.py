@@ -4,30 +4,41 @@ LNK-22 Messaging Test Script
 Tests sending messages between radios via serial
 """
 
+import re
 import serial
 import time
 import sys
 import threading
 
+from serial_utils import drain, iter_lines, read_until, wait_readable
+
 # Configuration
 PORTS = ['/dev/ttyACM0', '/dev/ttyACM1', '/dev/ttyACM2']
 BAUD = 115200
 TIMEOUT = 1
 
+# Node address in status output, e.g. "Node: LNK-048F (0x4D77048F)"
+ADDR_RE = re.compile(r'0x([0-9A-Fa-f]+)')
+
 def read_serial(ser, name, duration=5):
     """Read from serial port for a duration"""
-    end_time = time.time() + duration
+    end_time = time.monotonic() + duration
     output = []
-    while time.time() < end_time:
+    buf = bytearray()
+    while time.monotonic() < end_time:
         try:
-            if ser.in_waiting:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
+            if not wait_readable([ser], end_time):
+                continue
+            # Take everything that is waiting in one read; a partial
+            # trailing line is carried over in buf to the next read
+            buf += ser.read(ser.in_waiting)
+            for raw in iter_lines(buf):
+                if raw:
+                    line = raw.decode('utf-8', errors='ignore')
                     print(f"[{name}] {line}")
                     output.append(line)
         except:
             pass
-        time.sleep(0.01)
     return output
 
 def send_command(ser, cmd):
@@ -67,27 +78,15 @@ def main():
     for port, ser in radios.items():
         ser.reset_input_buffer()
         send_command(ser, "status")
-        time.sleep(0.5)
 
         # Read response
-        lines = []
-        for _ in range(20):
-            try:
-                if ser.in_waiting:
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        lines.append(line)
-                        print(f"[{port}] {line}")
-                        # Parse node address
-                        if "Node:" in line and "0x" in line:
-                            # Extract address like "Node: LNK-048F (0x4D77048F)"
-                            import re
-                            match = re.search(r'0x([0-9A-Fa-f]+)', line)
-                            if match:
-                                addresses[port] = "0x" + match.group(1).upper()
-            except:
-                pass
-            time.sleep(0.05)
+        for line in drain(ser, max_wait=1.5):
+            print(f"[{port}] {line}")
+            # Parse node address
+            if "Node:" in line:
+                match = ADDR_RE.search(line)
+                if match:
+                    addresses[port] = "0x" + match.group(1).upper()
         print()
 
     print("\nRadio Addresses:")
@@ -101,11 +100,8 @@ def main():
         for port, ser in radios.items():
             ser.reset_input_buffer()
             send_command(ser, "neighbors")
-            time.sleep(1)
-            while ser.in_waiting:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    print(f"[{port}] {line}")
+            for line in drain(ser, max_wait=1):
+                print(f"[{port}] {line}")
         return
 
     # Test 1: Broadcast message from radio 0
@@ -126,17 +122,17 @@ def main():
     print(f"\nSending broadcast from {sender}: '{test_msg}'")
     send_command(radios[sender], f"send broadcast {test_msg}")
 
-    # Wait and check for reception
-    print("\nWaiting for message reception (5 seconds)...")
-    time.sleep(5)
+    # Watch the receivers until the message shows up or we give up
+    print("\nWaiting for message reception (up to 5 seconds)...")
+    names = {radios[port]: port for port in receivers}
+    deadline = time.monotonic() + 5
 
     received = False
-    for port in receivers:
-        ser = radios[port]
-        while ser.in_waiting:
+    while not received and time.monotonic() < deadline:
+        for ser in wait_readable(list(names), deadline):
             line = ser.readline().decode('utf-8', errors='ignore').strip()
             if line:
-                print(f"[{port}] {line}")
+                print(f"[{names[ser]}] {line}")
                 if "MESSAGE" in line or test_msg in line:
                     received = True
 
@@ -167,17 +163,14 @@ def main():
             send_command(radios[sender_port], f"send {dest_addr} {test_msg2}")
 
             # Wait and check
-            print("\nWaiting for message reception (5 seconds)...")
-            time.sleep(5)
+            print("\nWaiting for message reception (up to 5 seconds)...")
 
             received = False
-            ser = radios[receiver_port]
-            while ser.in_waiting:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    print(f"[{receiver_port}] {line}")
-                    if "MESSAGE" in line or test_msg2 in line:
-                        received = True
+            for line in read_until(radios[receiver_port], time.monotonic() + 5):
+                print(f"[{receiver_port}] {line}")
+                if "MESSAGE" in line or test_msg2 in line:
+                    received = True
+                    break
 
             if received:
                 print("\n✓ Direct message received!")
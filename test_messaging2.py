@@ -4,25 +4,35 @@ LNK-22 Messaging Test Script v2
 More detailed test showing sender output
 """
 
+import re
+import selectors
 import serial
 import time
-import threading
+from collections import defaultdict
+
+from serial_utils import read_raw_lines
 
 PORTS = ['/dev/ttyACM0', '/dev/ttyACM1', '/dev/ttyACM2']
 BAUD = 115200
 
-def reader_thread(ser, name, stop_event, output_list):
-    """Continuously read from serial"""
-    while not stop_event.is_set():
-        try:
-            if ser.in_waiting:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line and not line.startswith('[GPS]'):  # Filter GPS spam
-                    print(f"[{name}] {line}")
-                    output_list.append(line)
-        except:
-            pass
-        time.sleep(0.01)
+# "Node: <name> (0x4D77048F)" in status output
+ADDR_RE = re.compile(r'\(0x([0-9A-Fa-f]+)\)')
+
+def pump(sel, outputs, duration):
+    """Print every registered port's output for duration seconds and collect it into outputs[port]"""
+    deadline = time.monotonic() + duration
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        for key, _ in sel.select(timeout=remaining):
+            (name, buf), ser = key.data, key.fileobj
+            for raw in read_raw_lines(ser, buf):
+                if not raw or raw.startswith(b'[GPS]'):  # Filter GPS spam undecoded
+                    continue
+                line = raw.decode('utf-8', errors='ignore')
+                print(f"[{name}] {line}")
+                outputs[name].append(line)
 
 def main():
     print("=" * 60)
@@ -44,30 +54,25 @@ def main():
         print("ERROR: Need 2 radios")
         return
 
-    # Start reader threads
-    stop_event = threading.Event()
-    outputs = {port: [] for port in radios}
-    threads = []
+    # One selector watches every port; the kernel wakes us when bytes arrive
+    sel = selectors.DefaultSelector()
+    outputs = defaultdict(list)
     for port, ser in radios.items():
-        t = threading.Thread(target=reader_thread, args=(ser, port, stop_event, outputs[port]))
-        t.daemon = True
-        t.start()
-        threads.append(t)
+        sel.register(ser, selectors.EVENT_READ, data=(port, bytearray()))
 
-    time.sleep(1)
+    pump(sel, outputs, 1)
 
     # Get addresses first
     print("\n--- Getting addresses ---")
     for port, ser in radios.items():
         ser.write(b"status\n")
-        time.sleep(1)
+        pump(sel, outputs, 1)
 
     addresses = {}
     for port, lines in outputs.items():
         for line in lines:
             if "Node:" in line and "0x" in line:
-                import re
-                match = re.search(r'\(0x([0-9A-Fa-f]+)\)', line)
+                match = ADDR_RE.search(line)
                 if match:
                     addresses[port] = "0x" + match.group(1).upper()
                     break
@@ -75,8 +80,7 @@ def main():
     print(f"\nAddresses: {addresses}")
 
     # Clear outputs
-    for port in outputs:
-        outputs[port].clear()
+    outputs.clear()
 
     # Test broadcast from ACM1
     print("\n" + "=" * 60)
@@ -86,7 +90,7 @@ def main():
     radios['/dev/ttyACM1'].write(b"send broadcast HELLO_BROADCAST_TEST\n")
 
     # Wait and observe
-    time.sleep(5)
+    pump(sel, outputs, 5)
 
     # Check what the sender logged
     print("\n--- Sender (/dev/ttyACM1) output: ---")
@@ -98,8 +102,7 @@ def main():
         print(f"  {line}")
 
     # Clear outputs
-    for port in outputs:
-        outputs[port].clear()
+    outputs.clear()
 
     # Test direct message
     print("\n" + "=" * 60)
@@ -112,7 +115,7 @@ def main():
     radios['/dev/ttyACM1'].write(cmd.encode())
 
     # Wait
-    time.sleep(5)
+    pump(sel, outputs, 5)
 
     print("\n--- Sender (/dev/ttyACM1) output: ---")
     for line in outputs['/dev/ttyACM1']:
@@ -130,8 +133,7 @@ def main():
         print("\n✗ MESSAGE NOT RECEIVED")
 
     # Cleanup
-    stop_event.set()
-    time.sleep(0.5)
+    sel.close()
     for ser in radios.values():
         ser.close()
 
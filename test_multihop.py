@@ -3,10 +3,50 @@
 Multi-hop routing test for LNK-22
 Requires 3 radios positioned so R1 can't reach R3 directly
 """
+import re
 import serial
 import time
 import sys
 
+from serial_utils import read_raw_lines, read_raw_rest, wait_readable
+
+# Routing events of interest, all found in a single regex pass per line.
+# Matched against raw bytes so only the lines we print get decoded.
+EVENT_RE = re.compile('(?P<rreq>ROUTE_REQ)|(?P<rrep>ROUTE_REP)|(?P<fwd>Forward)'
+                      '|(?P<msg>MESSAGE from|📨)|(?P<tx>Sent packet|TX:)'.encode())
+
+# "Node Address: 0x4D77048F" in status output
+ADDR_RE = re.compile(rb'Node Address:.*?0x([0-9A-Fa-f]+)')
+
+# Neighbor table rows that start with a hex node address
+NBR_RE = re.compile(rb'^[ \t]*(0x[0-9A-Fa-f]+)', re.M)
+
+def events(line):
+    """Names of every event group that appears in the raw line"""
+    return {m.lastgroup for m in EVENT_RE.finditer(line)}
+
+def text(line):
+    """Decode a raw line for printing"""
+    return line.decode('utf-8', errors='ignore')
+
+def query_all(radios, command, wait):
+    """Send a command to every radio at once and return the raw bytes each printed within wait seconds"""
+    for ser in radios:
+        ser.write(command)
+    time.sleep(wait)
+    # read_raw_rest() finishes a line still arriving at the deadline, e.g. an
+    # address printed in two writes
+    return [b"\n".join(read_raw_rest(ser, bytearray())) for ser in radios]
+
+def parse_addr(raw):
+    """Node address (hex digits, no 0x) from status output, or None"""
+    m = ADDR_RE.search(raw)
+    return m.group(1).decode() if m else None
+
+def parse_neighbors(raw):
+    """Addresses listed in neighbor table output"""
+    return [addr.decode() for addr in NBR_RE.findall(raw)]
+
 print("=" * 60)
 print("LNK-22 Multi-Hop Routing Test")
 print("=" * 60)
@@ -30,29 +70,11 @@ try:
     r2.reset_input_buffer()
     r3.reset_input_buffer()
 
-    r1.write(b"status\n")
-    time.sleep(0.5)
-    while r1.in_waiting:
-        line = r1.readline().decode('utf-8', errors='ignore')
-        if "Node Address:" in line:
-            r1_addr = line.split("0x")[1].strip()
-            print(f"  Radio 1: 0x{r1_addr}")
-
-    r2.write(b"status\n")
-    time.sleep(0.5)
-    while r2.in_waiting:
-        line = r2.readline().decode('utf-8', errors='ignore')
-        if "Node Address:" in line:
-            r2_addr = line.split("0x")[1].strip()
-            print(f"  Radio 2: 0x{r2_addr}")
-
-    r3.write(b"status\n")
-    time.sleep(0.5)
-    while r3.in_waiting:
-        line = r3.readline().decode('utf-8', errors='ignore')
-        if "Node Address:" in line:
-            r3_addr = line.split("0x")[1].strip()
-            print(f"  Radio 3: 0x{r3_addr}")
+    r1_addr, r2_addr, r3_addr = map(parse_addr, query_all([r1, r2, r3], b"status\n", 0.6))
+
+    for n, addr in enumerate([r1_addr, r2_addr, r3_addr], 1):
+        if addr:
+            print(f"  Radio {n}: 0x{addr}")
 
     if not all([r1_addr, r2_addr, r3_addr]):
         print("ERROR: Could not detect all radio addresses!")
@@ -64,34 +86,9 @@ try:
     r2.reset_input_buffer()
     r3.reset_input_buffer()
 
-    r1.write(b"neighbors\n")
-    time.sleep(1)
-    r1_neighbors = []
-    while r1.in_waiting:
-        line = r1.readline().decode('utf-8', errors='ignore')
-        if "0x" in line and "Address" not in line and "===" not in line:
-            addr = line.split()[0]
-            r1_neighbors.append(addr)
+    r1_neighbors, r2_neighbors, r3_neighbors = map(parse_neighbors, query_all([r1, r2, r3], b"neighbors\n", 1))
     print(f"  Radio 1 neighbors: {r1_neighbors}")
-
-    r2.write(b"neighbors\n")
-    time.sleep(1)
-    r2_neighbors = []
-    while r2.in_waiting:
-        line = r2.readline().decode('utf-8', errors='ignore')
-        if "0x" in line and "Address" not in line and "===" not in line:
-            addr = line.split()[0]
-            r2_neighbors.append(addr)
     print(f"  Radio 2 neighbors: {r2_neighbors}")
-
-    r3.write(b"neighbors\n")
-    time.sleep(1)
-    r3_neighbors = []
-    while r3.in_waiting:
-        line = r3.readline().decode('utf-8', errors='ignore')
-        if "0x" in line and "Address" not in line and "===" not in line:
-            addr = line.split()[0]
-            r3_neighbors.append(addr)
     print(f"  Radio 3 neighbors: {r3_neighbors}")
 
     # Check if multi-hop is needed
@@ -119,55 +116,60 @@ try:
     print("\n[4/5] Monitoring all radios for routing activity...")
     print("=" * 60)
 
-    start_time = time.time()
+    deadline = time.monotonic() + 10
     route_req_seen = False
     route_rep_seen = False
     forward_seen = False
     message_received = False
+    bufs = [bytearray(), bytearray(), bytearray()]
+    test_message_raw = test_message.encode()
+
+    while time.monotonic() < deadline:
+        # Sleep until any radio has output instead of spinning
+        wait_readable([r1, r2, r3], deadline)
 
-    while (time.time() - start_time) < 10:
         # Radio 1
-        if r1.in_waiting:
-            line = r1.readline().decode('utf-8', errors='ignore').strip()
+        for line in read_raw_lines(r1, bufs[0]):
             if line:
-                if "ROUTE_REQ" in line:
+                seen = events(line)
+                if "rreq" in seen:
                     route_req_seen = True
-                    print(f"R1: {line}")
-                elif "ROUTE_REP" in line:
+                    print(f"R1: {text(line)}")
+                elif "rrep" in seen:
                     route_rep_seen = True
-                    print(f"R1: {line}")
-                elif "Sent packet" in line or "TX:" in line:
-                    print(f"R1: {line}")
+                    print(f"R1: {text(line)}")
+                elif "tx" in seen:
+                    print(f"R1: {text(line)}")
 
         # Radio 2
-        if r2.in_waiting:
-            line = r2.readline().decode('utf-8', errors='ignore').strip()
+        for line in read_raw_lines(r2, bufs[1]):
             if line:
-                if "ROUTE_REQ" in line:
+                seen = events(line)
+                if "rreq" in seen:
                     route_req_seen = True
-                    print(f"R2: {line}")
-                elif "ROUTE_REP" in line:
+                    print(f"R2: {text(line)}")
+                elif "rrep" in seen:
                     route_rep_seen = True
-                    print(f"R2: {line}")
-                elif "Forward" in line:
+                    print(f"R2: {text(line)}")
+                elif "fwd" in seen:
                     forward_seen = True
-                    print(f"R2: ✅ {line}")
+                    print(f"R2: ✅ {text(line)}")
 
         # Radio 3
-        if r3.in_waiting:
-            line = r3.readline().decode('utf-8', errors='ignore').strip()
+        for line in read_raw_lines(r3, bufs[2]):
             if line:
-                if "MESSAGE from" in line or "📨" in line:
+                seen = events(line)
+                if "msg" in seen:
                     message_received = True
-                    print(f"R3: ✅ {line}")
-                elif "ROUTE_REQ" in line:
+                    print(f"R3: ✅ {text(line)}")
+                elif "rreq" in seen:
                     route_req_seen = True
-                    print(f"R3: {line}")
-                elif "ROUTE_REP" in line:
+                    print(f"R3: {text(line)}")
+                elif "rrep" in seen:
                     route_rep_seen = True
-                    print(f"R3: {line}")
-                elif test_message in line:
-                    print(f"R3: ✅ MESSAGE CONTENT: {line}")
+                    print(f"R3: {text(line)}")
+                elif test_message_raw in line:
+                    print(f"R3: ✅ MESSAGE CONTENT: {text(line)}")
 
     print("=" * 60)
 
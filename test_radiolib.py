@@ -3,6 +3,8 @@ import serial
 import time
 import sys
 
+from serial_utils import read_lines, read_rest, wait_readable
+
 print("Testing RadioLib Communication...")
 print("\nOpening both radios...")
 
@@ -23,22 +25,25 @@ try:
 
     # Monitor both radios for 10 seconds
     print("\n=== Monitoring for RX activity ===\n")
-    start_time = time.time()
+    deadline = time.monotonic() + 10
     r1_rx_count = 0
     r2_rx_count = 0
+    r1_buf = bytearray()
+    r2_buf = bytearray()
+
+    while time.monotonic() < deadline:
+        # Sleep until either radio has output instead of spinning
+        wait_readable([r1, r2], deadline)
 
-    while (time.time() - start_time) < 10:
         # Check Radio 1
-        if r1.in_waiting:
-            line = r1.readline().decode('utf-8', errors='ignore').strip()
+        for line in read_lines(r1, r1_buf):
             if line:
                 print(f"R1: {line}")
                 if "[ISR] OnRxDone!" in line or "RX:" in line:
                     r1_rx_count += 1
 
         # Check Radio 2
-        if r2.in_waiting:
-            line = r2.readline().decode('utf-8', errors='ignore').strip()
+        for line in read_lines(r2, r2_buf):
             if line:
                 print(f"R2: {line}")
                 if "[ISR] OnRxDone!" in line or "RX:" in line:
@@ -59,12 +64,12 @@ try:
         time.sleep(1)
 
         print("\n=== Radio 1 Status ===")
-        while r1.in_waiting:
-            print(r1.readline().decode('utf-8', errors='ignore').strip())
+        for line in read_rest(r1, r1_buf):
+            print(line)
 
         print("\n=== Radio 2 Status ===")
-        while r2.in_waiting:
-            print(r2.readline().decode('utf-8', errors='ignore').strip())
+        for line in read_rest(r2, r2_buf):
+            print(line)
 
     r1.close()
     r2.close()
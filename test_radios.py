@@ -6,6 +6,8 @@ import serial
 import time
 import sys
 
+from serial_utils import read_rest
+
 def test_radio(port, name):
     print(f"\n{'='*60}")
     print(f"Testing {name} on {port}")
@@ -23,11 +25,7 @@ def test_radio(port, name):
         time.sleep(1)
 
         # Read response
-        output = []
-        while ser.in_waiting:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            if line:
-                output.append(line)
+        output = [line for line in read_rest(ser, bytearray()) if line]
 
         print("\n".join(output))
 
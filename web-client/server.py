@@ -1,24 +1,57 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server with no-cache headers for development
+
+Uses aiohttp when it is installed (sendfile + keep-alive), otherwise falls
+back to the standard library's threaded http.server.
 """
 
 import http.server
-import socketserver
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
 
 PORT = 3000
 
+NO_CACHE_HEADERS = {
+    'Cache-Control': 'no-store, no-cache, must-revalidate, max-age=0',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+}
+
 class NoCacheHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate, max-age=0')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        for name, value in NO_CACHE_HEADERS.items():
+            self.send_header(name, value)
         super().end_headers()
 
-class ReusableTCPServer(socketserver.TCPServer):
+class ReusableTCPServer(http.server.ThreadingHTTPServer):
+    # One thread per request so the browser's parallel asset fetches don't queue
     allow_reuse_address = True
+    daemon_threads = True
+
+async def add_no_cache(request, response):
+    response.headers.update(NO_CACHE_HEADERS)
 
-with ReusableTCPServer(("", PORT), NoCacheHandler) as httpd:
+async def index(request):
+    return web.FileResponse('index.html')
+
+def run_aiohttp():
+    """Serve the current directory with aiohttp's static handler"""
+    app = web.Application()
+    app.on_response_prepare.append(add_no_cache)
+    app.router.add_get('/', index)
+    app.router.add_static('/', path='.', show_index=True)
+    web.run_app(app, port=PORT, print=None)
+
+if __name__ == "__main__":
     print(f"LNK-22 Web Client running at http://localhost:{PORT}")
     print("Press Ctrl+C to stop")
-    httpd.serve_forever()
+
+    if web is not None:
+        run_aiohttp()
+    else:
+        with ReusableTCPServer(("", PORT), NoCacheHandler) as httpd:
+            httpd.serve_forever()
@@ -14,7 +14,7 @@ Default port is 8765.
 import asyncio
 import json
 import sys
-from datetime import datetime
+import time
 
 try:
     import websockets
@@ -23,10 +23,35 @@ except ImportError:
     print("Install with: pip3 install websockets")
     sys.exit(1)
 
+# Optional speedups: orjson for the JSON hot path, uvloop for the event loop
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def json_loads(data):
+    """Parse a JSON frame (str or bytes)."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize to a JSON str; clients expect text frames."""
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
 # Connected clients: { client_id: websocket }
 clients = {}
 
-# Client info: { client_id: { name, last_seen } }
+# Client info: { client_id: { name, last_seen (epoch seconds), leave_msg } }
 client_info = {}
 
 
@@ -35,7 +60,9 @@ async def register(websocket, client_id, name=None):
     clients[client_id] = websocket
     client_info[client_id] = {
         'name': name or client_id,
-        'last_seen': datetime.now().isoformat()
+        'last_seen': time.time(),
+        # "leave" notice sent to the others on disconnect, serialized once here
+        'leave_msg': json_dumps({'type': 'leave', 'from': client_id})
     }
     print(f"[+] Client registered: {client_id} ({name or 'unnamed'})")
     print(f"    Total clients: {len(clients)}")
@@ -45,27 +72,25 @@ async def unregister(client_id):
     """Unregister a client."""
     if client_id in clients:
         del clients[client_id]
-    if client_id in client_info:
-        del client_info[client_id]
+    info = client_info.pop(client_id, None)
     print(f"[-] Client unregistered: {client_id}")
     print(f"    Total clients: {len(clients)}")
 
     # Notify other clients
-    leave_msg = json.dumps({
-        'type': 'leave',
-        'from': client_id
-    })
+    if info:
+        leave_msg = info['leave_msg']
+    else:
+        leave_msg = json_dumps({'type': 'leave', 'from': client_id})
     await broadcast(leave_msg, exclude=client_id)
 
 
 async def broadcast(message, exclude=None):
     """Broadcast message to all clients except the excluded one."""
-    for client_id, websocket in list(clients.items()):
-        if client_id != exclude:
-            try:
-                await websocket.send(message)
-            except websockets.exceptions.ConnectionClosed:
-                await unregister(client_id)
+    # websockets.broadcast() encodes the text frame once and writes it to every
+    # connection without waiting on any of them. Closed connections are skipped;
+    # their handler's finally block unregisters them.
+    targets = [clients[client_id] for client_id in clients.keys() - {exclude}]
+    websockets.broadcast(targets, message)
 
 
 async def send_to(client_id, message):
@@ -79,6 +104,45 @@ async def send_to(client_id, message):
     return False
 
 
+async def handle_announce(client_id, message, raw_message):
+    """Broadcast announcement to all other clients."""
+    print(f"[*] Announce from {client_id}: {message.get('name', 'unnamed')}")
+    await broadcast(raw_message, exclude=client_id)
+
+
+async def handle_relay(client_id, message, raw_message):
+    """Relay an offer/answer/ice-candidate to a specific peer."""
+    msg_type = message.get('type')
+    to_id = message.get('to')
+    if to_id:
+        success = await send_to(to_id, raw_message)
+        if not success:
+            print(f"[!] Failed to relay {msg_type} to {to_id}")
+    else:
+        print(f"[!] {msg_type} message missing 'to' field")
+
+
+async def handle_broadcast(client_id, message, raw_message):
+    """Broadcast to all other clients."""
+    await broadcast(raw_message, exclude=client_id)
+
+
+async def handle_unknown(client_id, message, raw_message):
+    """Unknown message type, broadcast it."""
+    print(f"[?] Unknown message type: {message.get('type')}")
+    await broadcast(raw_message, exclude=client_id)
+
+
+# Message type -> handler coroutine; anything else goes to handle_unknown
+HANDLERS = {
+    'announce': handle_announce,
+    'offer': handle_relay,
+    'answer': handle_relay,
+    'ice-candidate': handle_relay,
+    'broadcast': handle_broadcast,
+}
+
+
 async def handler(websocket, path):
     """Handle WebSocket connections."""
     client_id = None
@@ -86,12 +150,11 @@ async def handler(websocket, path):
     try:
         async for raw_message in websocket:
             try:
-                message = json.loads(raw_message)
-            except json.JSONDecodeError:
+                message = json_loads(raw_message)
+            except json.JSONDecodeError:  # orjson's error subclasses this
                 print(f"[!] Invalid JSON received")
                 continue
 
-            msg_type = message.get('type')
             from_id = message.get('from')
 
             # First message should identify the client
@@ -105,34 +168,14 @@ async def handler(websocket, path):
 
             # Update last seen
             if client_id in client_info:
-                client_info[client_id]['last_seen'] = datetime.now().isoformat()
+                client_info[client_id]['last_seen'] = time.time()
                 if message.get('name'):
                     client_info[client_id]['name'] = message.get('name')
 
-            # Handle message types
-            if msg_type == 'announce':
-                # Broadcast announcement to all other clients
-                print(f"[*] Announce from {client_id}: {message.get('name', 'unnamed')}")
-                await broadcast(raw_message, exclude=client_id)
-
-            elif msg_type in ['offer', 'answer', 'ice-candidate']:
-                # Relay to specific peer
-                to_id = message.get('to')
-                if to_id:
-                    success = await send_to(to_id, raw_message)
-                    if not success:
-                        print(f"[!] Failed to relay {msg_type} to {to_id}")
-                else:
-                    print(f"[!] {msg_type} message missing 'to' field")
-
-            elif msg_type == 'broadcast':
-                # Broadcast to all clients
-                await broadcast(raw_message, exclude=client_id)
-
-            else:
-                # Unknown message type, broadcast it
-                print(f"[?] Unknown message type: {msg_type}")
-                await broadcast(raw_message, exclude=client_id)
+            # Handle message types (a non-string type would be unhashable)
+            msg_type = message.get('type')
+            handle = HANDLERS.get(msg_type, handle_unknown) if isinstance(msg_type, str) else handle_unknown
+            await handle(client_id, message, raw_message)
 
     except websockets.exceptions.ConnectionClosed:
         pass
@@ -164,6 +207,9 @@ Press Ctrl+C to stop.
 if __name__ == "__main__":
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
 
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         asyncio.run(main(port))
     except KeyboardInterrupt:
@@ -1435,7 +1435,8 @@ async function connectWANBridge(serverUrl = null) {
             wanState.socket.send(JSON.stringify({
                 type: 'register',
                 site_id: wanState.siteId,
-                name: wanState.siteName
+                name: wanState.siteName,
+                supports_batch: true  // We unwrap JSON array frames
             }));
         };
 
@@ -1492,83 +1493,98 @@ function disconnectWANBridge() {
 
 // Handle incoming WAN message
 function handleWANMessage(data) {
+    let message;
     try {
-        const message = JSON.parse(data);
+        message = JSON.parse(data);
+    } catch (error) {
+        console.error('[WAN] Failed to parse message:', error);
+        return;
+    }
 
-        switch (message.type) {
-            case 'registered':
-                wanState.connected = true;
-                wanState.reconnectAttempts = 0;
-                addConsoleMessage(`[WAN] Registered as ${wanState.siteName}`, 'success');
-                showToast('Connected to WAN Bridge', 'success');
+    // The bridge coalesces bursts of messages into one JSON array frame;
+    // one bad message shouldn't cost the rest of the batch
+    for (const m of Array.isArray(message) ? message : [message]) {
+        try {
+            dispatchWANMessage(m);
+        } catch (error) {
+            console.error('[WAN] Failed to handle message:', error);
+        }
+    }
+}
 
-                // Start heartbeat
-                wanState.heartbeatInterval = setInterval(sendWANHeartbeat, 30000);
+// Act on a single WAN bridge message
+function dispatchWANMessage(message) {
+    switch (message.type) {
+        case 'registered':
+            wanState.connected = true;
+            wanState.reconnectAttempts = 0;
+            addConsoleMessage(`[WAN] Registered as ${wanState.siteName}`, 'success');
+            showToast('Connected to WAN Bridge', 'success');
 
-                // Report our nodes
-                reportLocalNodes();
+            // Start heartbeat
+            wanState.heartbeatInterval = setInterval(sendWANHeartbeat, 30000);
 
-                updateWANStatus();
-                break;
+            // Report our nodes
+            reportLocalNodes();
 
-            case 'sites_list':
-            case 'sites_update':
-                // Update remote sites
-                wanState.remoteSites.clear();
-                for (const site of message.sites || []) {
-                    if (site.site_id !== wanState.siteId?.slice(0, 16)) {
-                        wanState.remoteSites.set(site.site_id, {
-                            name: site.name,
-                            nodes: site.nodes || 0
-                        });
-                    }
-                }
-                updateWANSitesList();
-                break;
+            updateWANStatus();
+            break;
 
-            case 'site_joined':
-                addConsoleMessage(`[WAN] Site joined: ${message.name}`, 'success');
-                wanState.remoteSites.set(message.site_id, {
-                    name: message.name,
-                    nodes: 0
-                });
-                updateWANSitesList();
-                break;
+        case 'sites_list':
+        case 'sites_update':
+            // Update remote sites
+            wanState.remoteSites.clear();
+            for (const site of message.sites || []) {
+                if (site.site_id !== wanState.siteId?.slice(0, 16)) {
+                    wanState.remoteSites.set(site.site_id, {
+                        name: site.name,
+                        nodes: site.nodes || 0
+                    });
+                }
+            }
+            updateWANSitesList();
+            break;
 
-            case 'site_left':
-                addConsoleMessage(`[WAN] Site left: ${message.name}`, 'info');
-                wanState.remoteSites.delete(message.site_id);
-                updateWANSitesList();
-                break;
+        case 'site_joined':
+            addConsoleMessage(`[WAN] Site joined: ${message.name}`, 'success');
+            wanState.remoteSites.set(message.site_id, {
+                name: message.name,
+                nodes: 0
+            });
+            updateWANSitesList();
+            break;
 
-            case 'mesh_message':
-                // Incoming mesh message from another site
-                addConsoleMessage(`[WAN] Message from ${message.from_site}: ${message.content}`, 'output');
+        case 'site_left':
+            addConsoleMessage(`[WAN] Site left: ${message.name}`, 'info');
+            wanState.remoteSites.delete(message.site_id);
+            updateWANSitesList();
+            break;
 
-                // Add to local messages
-                const msgObj = {
-                    id: Date.now(),
-                    from: message.from,
-                    fromName: message.from_name || message.from_site,
-                    content: message.content,
-                    timestamp: new Date(),
-                    direction: 'incoming',
-                    type: 'WAN'
-                };
-                addReceivedMessage(msgObj);
+        case 'mesh_message':
+            // Incoming mesh message from another site
+            addConsoleMessage(`[WAN] Message from ${message.from_site}: ${message.content}`, 'output');
+
+            // Add to local messages
+            const msgObj = {
+                id: Date.now(),
+                from: message.from,
+                fromName: message.from_name || message.from_site,
+                content: message.content,
+                timestamp: new Date(),
+                direction: 'incoming',
+                type: 'WAN'
+            };
+            addReceivedMessage(msgObj);
 
-                // Relay to local radio if connected
-                if (state.connected && message.relay_local) {
-                    sendCommand(`send ${message.dest || 'broadcast'} [WAN:${message.from_site}] ${message.content}`);
-                }
-                break;
+            // Relay to local radio if connected
+            if (state.connected && message.relay_local) {
+                sendCommand(`send ${message.dest || 'broadcast'} [WAN:${message.from_site}] ${message.content}`);
+            }
+            break;
 
-            case 'error':
-                addConsoleMessage(`[WAN] Error: ${message.message}`, 'error');
-                break;
-        }
-    } catch (error) {
-        console.error('[WAN] Failed to parse message:', error);
+        case 'error':
+            addConsoleMessage(`[WAN] Error: ${message.message}`, 'error');
+            break;
     }
 }
 
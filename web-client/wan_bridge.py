@@ -28,9 +28,9 @@ import time
 import argparse
 import ssl
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Dict, Set, Optional
+from typing import Deque, Dict, Set, Optional, Tuple
 
 try:
     import websockets
@@ -39,8 +39,53 @@ except ImportError:
     print("Install with: pip3 install websockets")
     sys.exit(1)
 
+# Optional speedups: orjson for (de)serializing frames, uvloop for the event loop
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def json_dumps(obj) -> str:
+    """Serialize obj to a JSON text frame."""
+    # Frames stay text: the web client JSON.parse()s them, and a bytes frame
+    # would arrive as a Blob
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def json_loads(data):
+    """Parse a JSON frame (str or bytes)."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Frames a site may have waiting before it is considered too slow and dropped
+SEND_QUEUE_SIZE = 1024
 
-@dataclass
+# Largest frame accepted from a site; a nodes_update for a few thousand
+# nodes fits comfortably
+MAX_FRAME_SIZE = 2**16
+
+# Messages a connection handles between updates of bridge.total_bytes
+BYTES_FLUSH_EVERY = 256
+
+# Most queued frames coalesced into one JSON array frame by a site's writer
+MAX_BATCH = 32
+
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Site:
     """Represents a connected mesh site/network."""
     site_id: str
@@ -48,9 +93,14 @@ class Site:
     name: str = ""
     nodes: Set[str] = field(default_factory=set)  # Node addresses at this site
     connected_at: datetime = field(default_factory=datetime.now)
-    last_heartbeat: datetime = field(default_factory=datetime.now)
+    last_heartbeat: float = field(default_factory=time.monotonic)
     messages_relayed: int = 0
     bytes_relayed: int = 0
+    # Outgoing frames, sent in order by the site's writer task
+    out_queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SEND_QUEUE_SIZE))
+    writer_task: Optional[asyncio.Task] = None
+    dropped: bool = False  # Set when out_queue overflows; the writer then closes the connection
+    batching: bool = False  # Site registered with supports_batch and unwraps array frames
 
 
 class WANBridge:
@@ -60,26 +110,48 @@ class WANBridge:
         # Connected sites: { site_id: Site }
         self.sites: Dict[str, Site] = {}
 
-        # Message deduplication: { message_hash: timestamp }
-        self.seen_messages: Dict[str, float] = {}
+        # Message deduplication: hashes seen within the TTL, plus the same
+        # hashes in arrival order so expired ones come off the left end
+        self.seen_hashes: Set[bytes] = set()
+        self.seen_queue: Deque[Tuple[bytes, float]] = deque()
         self.message_ttl = 60  # seconds
+        self.max_seen_messages = 100_000  # Memory bound under message floods
 
         # Routing table: { node_address: site_id }
         self.routing_table: Dict[str, str] = {}
 
+        # Serialized site list frames: { 'sites_update' | 'sites_list': frame }.
+        # Cleared whenever a site joins, leaves or reports its nodes.
+        self.sites_frames: Dict[str, str] = {}
+
         # Statistics
         self.total_messages = 0
         self.total_bytes = 0
-        self.start_time = datetime.now()
+        self.start_time = time.monotonic()
 
-    async def register_site(self, websocket, site_id: str, name: str = "") -> Site:
+    async def register_site(self, websocket, site_id: str, name: str = "",
+                            batching: bool = False) -> Site:
         """Register a new site connection."""
         site = Site(
             site_id=site_id,
             websocket=websocket,
-            name=name or f"Site-{site_id[:8]}"
+            name=name or f"Site-{site_id[:8]}",
+            batching=batching
         )
+        old = self.sites.get(site_id)
+        if old:
+            # Same site id registering again (another tab, or a reconnect
+            # before the old socket died): retire the old entry's writer and
+            # routes, and close its socket. The close runs in the background
+            # (held in the retired writer_task slot) so a dead peer's close
+            # timeout doesn't hold up this registration.
+            print(f"[*] Site {old.name} re-registered, closing its previous connection")
+            old.writer_task.cancel()
+            self.drop_routes(site_id, old.nodes)
+            old.writer_task = asyncio.create_task(old.websocket.close())
+        site.writer_task = asyncio.create_task(self.site_writer(site))
         self.sites[site_id] = site
+        self.sites_frames.clear()
         print(f"[+] Site registered: {site.name} ({site_id[:16]}...)")
         print(f"    Total sites: {len(self.sites)}")
 
@@ -87,19 +159,18 @@ class WANBridge:
         await self.broadcast_site_update()
         return site
 
-    async def unregister_site(self, site_id: str):
-        """Unregister a site."""
-        if site_id in self.sites:
-            site = self.sites[site_id]
+    async def unregister_site(self, site: Site):
+        """Unregister a site, unless its id has since been taken over by a newer connection."""
+        site_id = site.site_id
+        if self.sites.get(site_id) is site:
             print(f"[-] Site disconnected: {site.name}")
 
             # Remove node routes for this site
-            self.routing_table = {
-                node: sid for node, sid in self.routing_table.items()
-                if sid != site_id
-            }
+            self.drop_routes(site_id, site.nodes)
 
             del self.sites[site_id]
+            self.sites_frames.clear()
+            site.writer_task.cancel()
             print(f"    Total sites: {len(self.sites)}")
 
             # Notify other sites
@@ -109,86 +180,147 @@ class WANBridge:
                 'name': site.name
             }, exclude=site_id)
 
+    def sites_frame(self, msg_type: str) -> str:
+        """Serialized sites_update or sites_list frame, rebuilt only after the sites change."""
+        frame = self.sites_frames.get(msg_type)
+        if frame is None:
+            if msg_type == 'sites_update':
+                frame = json_dumps({
+                    'type': 'sites_update',
+                    'sites': [
+                        {
+                            'site_id': sid[:16],  # Truncate for privacy
+                            'name': site.name,
+                            'nodes': len(site.nodes),
+                            'connected_since': site.connected_at.isoformat()
+                        }
+                        for sid, site in self.sites.items()
+                    ],
+                    'total_sites': len(self.sites)
+                })
+            else:
+                frame = json_dumps({
+                    'type': 'sites_list',
+                    'sites': [
+                        {'site_id': sid[:16], 'name': s.name, 'nodes': len(s.nodes)}
+                        for sid, s in self.sites.items()
+                    ]
+                })
+            self.sites_frames[msg_type] = frame
+        return frame
+
     async def broadcast_site_update(self):
         """Broadcast current site list to all connected sites."""
-        sites_info = []
-        for sid, site in self.sites.items():
-            sites_info.append({
-                'site_id': sid[:16],  # Truncate for privacy
-                'name': site.name,
-                'nodes': len(site.nodes),
-                'connected_since': site.connected_at.isoformat()
-            })
-
-        await self.broadcast({
-            'type': 'sites_update',
-            'sites': sites_info,
-            'total_sites': len(self.sites)
-        })
+        await self.broadcast_frame(self.sites_frame('sites_update'))
+
+    async def site_writer(self, site: Site):
+        """Send a site's queued frames in order until it disconnects or is dropped."""
+        try:
+            while not site.dropped:
+                msg_str = await site.out_queue.get()
+                if site.batching and not site.out_queue.empty():
+                    # A burst is waiting: send it as one JSON array frame,
+                    # which sites that registered with supports_batch unwrap
+                    batch = [msg_str]
+                    while not site.out_queue.empty() and len(batch) < MAX_BATCH:
+                        batch.append(site.out_queue.get_nowait())
+                    msg_str = '[' + ','.join(batch) + ']'
+                await site.websocket.send(msg_str)
+            # Closing ends the site's handler, which unregisters it
+            await site.websocket.close()
+        except websockets.exceptions.ConnectionClosed:
+            pass  # The site's handler unregisters it
+
+    def enqueue(self, site: Site, msg_str: str) -> bool:
+        """Queue a frame for a site without waiting on its connection."""
+        if site.dropped:
+            return False
+        try:
+            site.out_queue.put_nowait(msg_str)
+            return True
+        except asyncio.QueueFull:
+            # Don't let one slow site buffer without bound; its writer closes it
+            print(f"[!] Site {site.name} is not keeping up, disconnecting")
+            site.dropped = True
+            return False
 
     async def broadcast(self, message: dict, exclude: str = None):
         """Broadcast message to all sites except excluded one."""
-        msg_str = json.dumps(message)
-        for site_id, site in list(self.sites.items()):
+        await self.broadcast_frame(json_dumps(message), exclude)  # Serialize once for every site
+
+    async def broadcast_frame(self, msg_str: str, exclude: str = None):
+        """Broadcast an already serialized frame to all sites except excluded one."""
+        for site_id, site in self.sites.items():
             if site_id != exclude:
-                try:
-                    await site.websocket.send(msg_str)
-                except websockets.exceptions.ConnectionClosed:
-                    await self.unregister_site(site_id)
+                self.enqueue(site, msg_str)
 
     async def relay_to_site(self, target_site_id: str, message: dict) -> bool:
         """Relay message to a specific site."""
-        if target_site_id in self.sites:
-            try:
-                site = self.sites[target_site_id]
-                msg_str = json.dumps(message)
-                await site.websocket.send(msg_str)
+        return await self.relay_frame_to_site(target_site_id, json_dumps(message))
+
+    async def relay_frame_to_site(self, target_site_id: str, msg_str: str) -> bool:
+        """Relay an already serialized frame to a specific site."""
+        site = self.sites.get(target_site_id)
+        if site:
+            if self.enqueue(site, msg_str):
                 site.messages_relayed += 1
                 site.bytes_relayed += len(msg_str)
                 return True
-            except websockets.exceptions.ConnectionClosed:
-                await self.unregister_site(target_site_id)
         return False
 
-    def deduplicate_message(self, message: dict) -> bool:
+    def deduplicate_message(self, raw_message) -> bool:
         """Check if message is duplicate. Returns True if new, False if duplicate."""
-        # Create hash of message content
-        content = json.dumps(message, sort_keys=True)
-        msg_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
-
-        # Clean old messages
-        now = time.time()
-        self.seen_messages = {
-            h: t for h, t in self.seen_messages.items()
-            if now - t < self.message_ttl
-        }
+        # Hash the frame as received rather than re-serializing the parsed
+        # message; only a 64-bit dedup key is needed, not a cryptographic digest
+        if isinstance(raw_message, str):
+            raw_message = raw_message.encode()
+        msg_hash = hashlib.blake2b(raw_message, digest_size=8).digest()
+
+        # Expire old hashes; the queue is in arrival order, so stop at the
+        # first one still inside the TTL
+        now = time.monotonic()
+        while self.seen_queue and now - self.seen_queue[0][1] >= self.message_ttl:
+            self.seen_hashes.discard(self.seen_queue.popleft()[0])
 
         # Check if seen
-        if msg_hash in self.seen_messages:
+        if msg_hash in self.seen_hashes:
             return False  # Duplicate
 
-        self.seen_messages[msg_hash] = now
+        self.seen_hashes.add(msg_hash)
+        self.seen_queue.append((msg_hash, now))
+        if len(self.seen_queue) > self.max_seen_messages:
+            self.seen_hashes.discard(self.seen_queue.popleft()[0])
         return True  # New message
 
+    def drop_routes(self, site_id: str, nodes):
+        """Remove routes for nodes, unless a node has since moved to another site."""
+        for node in nodes:
+            if self.routing_table.get(node) == site_id:
+                del self.routing_table[node]
+
     def update_routing(self, site_id: str, nodes: list):
         """Update routing table with nodes from a site."""
-        for node in nodes:
-            self.routing_table[node] = site_id
+        new_nodes = set(nodes)
         if site_id in self.sites:
-            self.sites[site_id].nodes = set(nodes)
+            site = self.sites[site_id]
+            self.drop_routes(site_id, site.nodes - new_nodes)
+            site.nodes = new_nodes
+            self.sites_frames.clear()  # Node counts changed
+        for node in new_nodes:
+            self.routing_table[node] = site_id
 
     def find_route(self, dest_node: str) -> Optional[str]:
         """Find which site a node belongs to."""
         return self.routing_table.get(dest_node)
 
-    async def handle_message(self, site_id: str, message: dict):
-        """Handle incoming message from a site."""
+    async def handle_message(self, site_id: str, message: dict, raw_message):
+        """Handle incoming message from a site (raw_message is the frame it was parsed from)."""
         msg_type = message.get('type', '')
 
         if msg_type == 'heartbeat':
             # Update heartbeat
             if site_id in self.sites:
-                self.sites[site_id].last_heartbeat = datetime.now()
+                self.sites[site_id].last_heartbeat = time.monotonic()
             return
 
         elif msg_type == 'nodes_update':
@@ -200,45 +332,43 @@ class WANBridge:
 
         elif msg_type == 'mesh_message':
             # Message to relay across WAN
-            if not self.deduplicate_message(message):
+            if not self.deduplicate_message(raw_message):
                 return  # Duplicate
 
             self.total_messages += 1
 
+            # The message is forwarded unchanged, so send the frame as
+            # received instead of serializing the parsed copy again
             dest = message.get('dest')
             if dest:
                 # Unicast - find route
                 target_site = self.find_route(dest)
                 if target_site and target_site != site_id:
-                    await self.relay_to_site(target_site, message)
+                    if not await self.relay_frame_to_site(target_site, raw_message):
+                        # Stale route or site not keeping up; fall back to broadcast
+                        await self.broadcast_frame(raw_message, exclude=site_id)
                 else:
                     # Broadcast to all other sites
-                    await self.broadcast(message, exclude=site_id)
+                    await self.broadcast_frame(raw_message, exclude=site_id)
             else:
                 # Broadcast to all sites
-                await self.broadcast(message, exclude=site_id)
+                await self.broadcast_frame(raw_message, exclude=site_id)
 
         elif msg_type == 'query_sites':
             # Return list of connected sites
-            await self.relay_to_site(site_id, {
-                'type': 'sites_list',
-                'sites': [
-                    {'site_id': sid[:16], 'name': s.name, 'nodes': len(s.nodes)}
-                    for sid, s in self.sites.items()
-                ]
-            })
+            await self.relay_frame_to_site(site_id, self.sites_frame('sites_list'))
 
         else:
             # Unknown message type - relay as-is
-            if self.deduplicate_message(message):
-                await self.broadcast(message, exclude=site_id)
+            if self.deduplicate_message(raw_message):
+                await self.broadcast_frame(raw_message, exclude=site_id)
 
     def get_stats(self) -> dict:
         """Get bridge statistics."""
-        uptime = datetime.now() - self.start_time
+        uptime = int(time.monotonic() - self.start_time)
         return {
-            'uptime_seconds': int(uptime.total_seconds()),
-            'uptime_str': str(uptime).split('.')[0],
+            'uptime_seconds': uptime,
+            'uptime_str': str(timedelta(seconds=uptime)),
             'total_sites': len(self.sites),
             'total_nodes': len(self.routing_table),
             'total_messages': self.total_messages,
@@ -262,13 +392,22 @@ bridge = WANBridge()
 async def handler(websocket, path):
     """Handle WebSocket connections from sites."""
     site_id = None
+    site = None  # The Site this connection registered
+    # Received bytes are counted locally and added to bridge.total_bytes
+    # every BYTES_FLUSH_EVERY messages and on disconnect
+    unflushed_bytes = 0
+    unflushed_messages = 0
 
     try:
         # Wait for registration message
         async for raw_message in websocket:
+            if isinstance(raw_message, bytes):
+                # Binary frame; decode so it can be relayed as a text frame
+                raw_message = raw_message.decode('utf-8', errors='replace')
+
             try:
-                message = json.loads(raw_message)
-            except json.JSONDecodeError:
+                message = json_loads(raw_message)
+            except json.JSONDecodeError:  # orjson's error subclasses this
                 print(f"[!] Invalid JSON received")
                 continue
 
@@ -278,68 +417,79 @@ async def handler(websocket, path):
                     site_id = message.get('site_id')
                     name = message.get('name', '')
                     if not site_id:
-                        await websocket.send(json.dumps({
+                        await websocket.send(json_dumps({
                             'type': 'error',
                             'message': 'site_id required'
                         }))
                         return
 
-                    await bridge.register_site(websocket, site_id, name)
+                    site = await bridge.register_site(websocket, site_id, name,
+                                                      batching=message.get('supports_batch') is True)
 
-                    # Send welcome message
-                    await websocket.send(json.dumps({
+                    # Send welcome message (through the site's queue so it
+                    # stays in order with broadcasts)
+                    bridge.enqueue(site, json_dumps({
                         'type': 'registered',
                         'site_id': site_id,
                         'message': f'Welcome to LNK-22 WAN Bridge'
                     }))
 
-                    # Send current sites
-                    await websocket.send(json.dumps({
-                        'type': 'sites_list',
-                        'sites': [
-                            {'site_id': sid[:16], 'name': s.name, 'nodes': len(s.nodes)}
-                            for sid, s in bridge.sites.items()
-                            if sid != site_id
-                        ]
-                    }))
+                    # Send current sites (the client skips its own entry)
+                    bridge.enqueue(site, bridge.sites_frame('sites_list'))
                 else:
-                    await websocket.send(json.dumps({
+                    await websocket.send(json_dumps({
                         'type': 'error',
                         'message': 'Must register first'
                     }))
                 continue
 
+            # A newer connection has taken over this site id; stop acting for it
+            if bridge.sites.get(site_id) is not site:
+                break
+
             # Handle subsequent messages
-            await bridge.handle_message(site_id, message)
-            bridge.total_bytes += len(raw_message)
+            await bridge.handle_message(site_id, message, raw_message)
+            unflushed_bytes += len(raw_message)
+            unflushed_messages += 1
+            if unflushed_messages == BYTES_FLUSH_EVERY:
+                bridge.total_bytes += unflushed_bytes
+                unflushed_bytes = unflushed_messages = 0
 
     except websockets.exceptions.ConnectionClosed:
         pass
     finally:
-        if site_id:
-            await bridge.unregister_site(site_id)
+        bridge.total_bytes += unflushed_bytes
+        if site:
+            await bridge.unregister_site(site)
 
 
-async def heartbeat_checker():
-    """Periodically check for dead connections."""
-    while True:
-        await asyncio.sleep(30)
-        now = datetime.now()
-        for site_id, site in list(bridge.sites.items()):
-            if now - site.last_heartbeat > timedelta(seconds=90):
-                print(f"[!] Site {site.name} timed out")
-                await bridge.unregister_site(site_id)
+async def check_heartbeats():
+    """Drop sites that have stopped sending heartbeats."""
+    now = time.monotonic()
+    for site in list(bridge.sites.values()):
+        if now - site.last_heartbeat > 90:
+            print(f"[!] Site {site.name} timed out")
+            await bridge.unregister_site(site)
+
+
+def report_stats():
+    """Print a one-line stats summary."""
+    stats = bridge.get_stats()
+    print(f"[STATS] Sites: {stats['total_sites']}, "
+          f"Nodes: {stats['total_nodes']}, "
+          f"Messages: {stats['total_messages']}, "
+          f"Uptime: {stats['uptime_str']}")
 
 
-async def stats_reporter():
-    """Periodically report stats."""
+async def housekeeper():
+    """Check heartbeats every 30 seconds and report stats every 60, on one timer."""
+    tick = 0
     while True:
-        await asyncio.sleep(60)
-        stats = bridge.get_stats()
-        print(f"[STATS] Sites: {stats['total_sites']}, "
-              f"Nodes: {stats['total_nodes']}, "
-              f"Messages: {stats['total_messages']}, "
-              f"Uptime: {stats['uptime_str']}")
+        await asyncio.sleep(30)
+        tick += 1
+        await check_heartbeats()
+        if tick % 2 == 0:
+            report_stats()
 
 
 async def main(port: int, ssl_context=None):
@@ -368,12 +518,13 @@ Press Ctrl+C to stop.
 ----------------------------------------
 """)
 
-    # Start background tasks
-    asyncio.create_task(heartbeat_checker())
-    asyncio.create_task(stats_reporter())
+    # Start background housekeeping
+    asyncio.create_task(housekeeper())
 
-    # Start WebSocket server
-    async with websockets.serve(handler, "0.0.0.0", port, ssl=ssl_context):
+    # Start WebSocket server. Frames are small JSON, so skip permessage-deflate
+    # (zlib on every frame, both ways) and cap frames well below the 1 MiB default.
+    async with websockets.serve(handler, "0.0.0.0", port, ssl=ssl_context,
+                                compression=None, max_size=MAX_FRAME_SIZE):
         await asyncio.Future()  # Run forever
 
 
@@ -390,8 +541,16 @@ if __name__ == "__main__":
     if args.ssl_cert and args.ssl_key:
         ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
         ssl_context.load_cert_chain(args.ssl_cert, args.ssl_key)
+        # TLS 1.2+ with ECDHE AEAD suites only (AES-GCM, ChaCha20 for clients
+        # without AES hardware); session tickets stay on for cheap reconnects
+        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+        ssl_context.set_ciphers('ECDHE+AESGCM:ECDHE+CHACHA20')
+        ssl_context.set_alpn_protocols(['http/1.1'])
         print("[*] SSL enabled")
 
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         asyncio.run(main(args.port, ssl_context))
     except KeyboardInterrupt: